@@ -6,18 +6,46 @@ Clean, working version for "Open with" workflow
 
 import sys
 import os
+import platform
+import re
+import shlex
 import subprocess
 import tempfile
 import shutil
+import threading
 import time
 import select
+from collections import deque
+import fcntl
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
-                             QWidget, QLabel, QProgressBar, QMessageBox, QTextEdit, QPushButton,
-                             QDialog, QLineEdit, QDialogButtonBox, QFileDialog)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
+                             QWidget, QLabel, QProgressBar, QMessageBox, QPlainTextEdit, QPushButton,
+                             QDialog, QLineEdit, QDialogButtonBox, QFileDialog, QCheckBox)
+from PyQt5.QtCore import QThread, QThreadPool, QRunnable, QSettings, pyqtSignal, Qt, QTimer
 from PyQt5.QtGui import QFont
 
+# Converted packages, keyed by the SHA-256 of the .deb they came from
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'deb_installer'
+CACHE_LIMIT = 2 * 1024 ** 3  # Least recently used packages are evicted above this size
+PKG_SUFFIXES = ('.pkg.tar.zst', '.pkg.tar.xz')
+
+# Prefixes for the window's own console messages
+LOG_PKG = "📦 "
+LOG_RUN = "🚀 "
+LOG_ERR = "❌ "
+
+# Console separators and step headers, built once
+SEP_EQ = "=" * 50
+SEP_DASH = "-" * 50
+STEP_BANNERS = tuple(
+    f"{SEP_EQ}\nSTEP {i}/4: {name}\n{SEP_EQ}"
+    for i, name in enumerate(("Checking debtap", "Preparing workspace",
+                              "Converting package", "Installing package"), 1)
+)
+
+# Environment for debtap, built once (disables colored output)
+_DEBTAP_ENV = {**os.environ, 'DEBTAP_NOCOLOR': '1'}
+
 
 class SudoPasswordDialog(QDialog):
     """Dialog to get sudo password"""
@@ -69,15 +97,56 @@ class InstallWorker(QThread):
     progress_update = pyqtSignal(str)  # Status message
     progress_value = pyqtSignal(int)   # Progress percentage
     time_update = pyqtSignal(str)      # Time information
-    console_output = pyqtSignal(str)   # Console output
     finished = pyqtSignal(bool, str)   # Success, message
     
-    def __init__(self, deb_file_path, sudo_password=None):
+    _which_cache = {}  # Command name -> resolved path (or None)
+    
+    # pacman output that means it is waiting for an answer
+    _PROMPT_RE = re.compile(r'proceed with installation|continue\?|\[y/n\]|replace|conflict',
+                            re.IGNORECASE)
+    
+    # Known failure causes, checked in order of priority
+    _TIP_RE = re.compile(r'(conflicting files|dependency|signature|disk space|no space)',
+                         re.IGNORECASE)
+    _TIPS = {
+        'conflicting files': "💡 Tip: Package conflicts with existing files",
+        'dependency': "💡 Tip: Missing dependencies - try installing them first",
+        'signature': "💡 Tip: Signature issues - package might be corrupted",
+        'disk space': "💡 Tip: Insufficient disk space",
+        'no space': "💡 Tip: Insufficient disk space",
+    }
+    
+    def __init__(self, deb_file_path, sudo_password=None, size=None, basename=None):
         super().__init__()
         self.deb_file_path = deb_file_path
         self.sudo_password = sudo_password
+        # The GUI already knows these, only stat the file if it didn't pass them
+        self.size = size if size is not None else os.path.getsize(deb_file_path)
+        self.basename = basename or os.path.basename(deb_file_path)
         self.temp_dir = None
         self.start_time = None
+        # Console output is buffered here and drained by the GUI on a timer,
+        # which is much cheaper than a queued signal per line
+        self._out_buf = []
+        self._out_lock = threading.Lock()
+        self._askpass_fd = None
+        self._askpass_lock = threading.Lock()  # sudo may run from the database update thread too
+        self._db_executor = None
+        self._db_future = None
+    
+    def _enqueue(self, line):
+        """Queue a line of console output for the GUI"""
+        with self._out_lock:
+            self._out_buf.append(line)
+    
+    def take_output(self):
+        """Return all queued console output as one string and clear the queue"""
+        with self._out_lock:
+            if not self._out_buf:
+                return None
+            text = '\n'.join(self._out_buf)
+            self._out_buf.clear()
+        return text
     
     def run(self):
         """Main installation process with detailed progress"""
@@ -85,166 +154,278 @@ class InstallWorker(QThread):
         
         try:
             # Get file size for estimates
-            file_size_mb = os.path.getsize(self.deb_file_path) / (1024 * 1024)
+            file_size_mb = self.size / (1024 * 1024)
             conversion_time = max(10, int(file_size_mb * 2))
             install_time = max(5, int(file_size_mb * 0.5))
             total_estimated = conversion_time + install_time + 5
             
-            self.console_output.emit(f"📦 Package: {os.path.basename(self.deb_file_path)}")
-            self.console_output.emit(f"📏 Size: {file_size_mb:.1f} MB")
-            self.console_output.emit(f"⏱️  Estimated time: ~{total_estimated} seconds\n")
+            self._enqueue(f"📦 Package: {self.basename}")
+            self._enqueue(f"📏 Size: {file_size_mb:.1f} MB")
+            self._enqueue(f"⏱️  Estimated time: ~{total_estimated} seconds\n")
             self.time_update.emit(f"Estimated time: ~{total_estimated} seconds")
             
             # Step 1: Check if debtap is installed
             self.progress_update.emit("Checking for debtap...")
             self.progress_value.emit(5)
-            self.console_output.emit("="*50)
-            self.console_output.emit("STEP 1/4: Checking debtap")
-            self.console_output.emit("="*50)
+            self._enqueue(STEP_BANNERS[0])
             
             step_start = time.time()
             if not self.check_debtap():
-                self.console_output.emit("❌ debtap setup failed!")
+                self._enqueue("❌ debtap setup failed!")
                 self.finished.emit(False, "debtap setup failed! Please check the console output for details.")
                 return
             
             step_time = time.time() - step_start
-            self.console_output.emit(f"✅ debtap ready! ({step_time:.1f}s)\n")
+            self._enqueue(f"✅ debtap ready! ({step_time:.1f}s)\n")
             self.time_update.emit(f"debtap check completed in {step_time:.1f}s")
             
             # Step 2: Create temporary directory
             self.progress_update.emit("Preparing workspace...")
             self.progress_value.emit(10)
-            self.console_output.emit("="*50)
-            self.console_output.emit("STEP 2/4: Preparing workspace")
-            self.console_output.emit("="*50)
-            
-            self.temp_dir = tempfile.mkdtemp(prefix="deb_installer_")
-            self.console_output.emit(f"📁 Working directory: {self.temp_dir}")
-            
-            # Step 3: Copy file
-            self.progress_update.emit("Copying package file...")
-            self.progress_value.emit(15)
-            
-            step_start = time.time()
-            deb_filename = os.path.basename(self.deb_file_path)
-            temp_deb_path = os.path.join(self.temp_dir, deb_filename)
-            shutil.copy2(self.deb_file_path, temp_deb_path)
-            step_time = time.time() - step_start
-            self.console_output.emit(f"✅ File copied in {step_time:.1f}s\n")
-            self.time_update.emit(f"File copied in {step_time:.1f}s")
-            
-            # Step 4: Convert .deb to Arch package
-            self.progress_update.emit(f"Converting package... (est. {conversion_time}s)")
-            self.progress_value.emit(20)
-            self.console_output.emit("="*50)
-            self.console_output.emit("STEP 3/4: Converting package")
-            self.console_output.emit("="*50)
-            self.console_output.emit(f"🔄 Converting {deb_filename} to Arch package...")
-            self.console_output.emit(f"📝 Running: debtap -q {deb_filename}")
-            self.console_output.emit("-" * 50)
-            
-            step_start = time.time()
-            arch_package = self.convert_deb_package(temp_deb_path)
-            step_time = time.time() - step_start
-            
-            if not arch_package:
-                self.console_output.emit(f"❌ Conversion failed after {step_time:.1f}s")
-                self.finished.emit(False, f"Failed to convert .deb package after {step_time:.1f}s")
-                return
-            
-            pkg_size_mb = os.path.getsize(arch_package) / (1024 * 1024)
-            self.console_output.emit("-" * 50)
-            self.console_output.emit(f"✅ Conversion completed in {step_time:.1f}s")
-            self.console_output.emit(f"📦 Generated: {os.path.basename(arch_package)} ({pkg_size_mb:.1f} MB)\n")
-            self.time_update.emit(f"Conversion completed in {step_time:.1f}s")
-            self.progress_value.emit(70)
-            
-            # Step 5: Install the converted package
-            self.progress_update.emit(f"Installing package... ({pkg_size_mb:.1f} MB)")
-            self.progress_value.emit(75)
-            self.console_output.emit("="*50)
-            self.console_output.emit("STEP 4/4: Installing package")
-            self.console_output.emit("="*50)
-            self.console_output.emit(f"📥 Installing {os.path.basename(arch_package)}...")
-            self.console_output.emit("🔐 Running: sudo pacman -U --noconfirm")
-            self.console_output.emit("-" * 50)
+            self._enqueue(STEP_BANNERS[1])
             
-            step_start = time.time()
-            if self.install_arch_package(arch_package):
-                step_time = time.time() - step_start
-                total_time = time.time() - self.start_time
+            # The workspace is removed when the with block exits, however it exits
+            with tempfile.TemporaryDirectory(prefix="deb_installer_",
+                                             ignore_cleanup_errors=True) as self.temp_dir:
+                self._enqueue(f"📁 Working directory: {self.temp_dir}")
                 
-                self.console_output.emit("-" * 50)
-                self.console_output.emit(f"✅ Installation completed in {step_time:.1f}s")
-                self.console_output.emit("\n" + "="*50)
-                self.console_output.emit("🎉 SUCCESS!")
-                self.console_output.emit("="*50)
-                self.console_output.emit(f"⏱️  Total time: {total_time:.1f} seconds")
+                # Reuse an earlier conversion of the same .deb if there is one
+                digest = self._hash_deb()
+                arch_package = self._cached_package(digest)
+                from_cache = arch_package is not None
                 
-                self.progress_update.emit("Installation completed!")
-                self.progress_value.emit(100)
-                self.time_update.emit(f"Total time: {total_time:.1f}s")
-                self.finished.emit(True, f"Package installed successfully!\nTotal time: {total_time:.1f} seconds")
-            else:
-                step_time = time.time() - step_start
-                self.console_output.emit("-" * 50)
-                self.console_output.emit(f"❌ Installation failed after {step_time:.1f}s")
-                self.finished.emit(False, f"Failed to install package after {step_time:.1f}s")
+                # Both the conversion and pacman need the debtap database
+                # update (if one was started) to be done
+                self._wait_for_db_update()
+                
+                if arch_package:
+                    self._enqueue(f"♻️  Using cached conversion: {arch_package}")
+                else:
+                    # Step 3: Copy file
+                    self.progress_update.emit("Copying package file...")
+                    self.progress_value.emit(15)
+                    
+                    step_start = time.time()
+                    deb_filename = self.basename
+                    temp_deb_path = os.path.join(self.temp_dir, deb_filename)
+                    # debtap only reads the input, so link it instead of copying
+                    # when possible and fall back to a real copy across devices
+                    try:
+                        os.link(self.deb_file_path, temp_deb_path)
+                    except OSError:
+                        try:
+                            os.symlink(os.path.abspath(self.deb_file_path), temp_deb_path)
+                        except OSError:
+                            shutil.copy2(self.deb_file_path, temp_deb_path)
+                    step_time = time.time() - step_start
+                    self._enqueue(f"✅ File copied in {step_time:.1f}s\n")
+                    self.time_update.emit(f"File copied in {step_time:.1f}s")
+                    
+                    # Step 4: Convert .deb to Arch package
+                    self.progress_update.emit(f"Converting package... (est. {conversion_time}s)")
+                    self.progress_value.emit(20)
+                    self._enqueue(STEP_BANNERS[2])
+                    self._enqueue(f"🔄 Converting {deb_filename} to Arch package...")
+                    self._enqueue(f"📝 Running: debtap -q {deb_filename}")
+                    self._enqueue(SEP_DASH)
+                    
+                    step_start = time.time()
+                    arch_package = self.convert_deb_package(temp_deb_path)
+                    step_time = time.time() - step_start
+                    
+                    if not arch_package:
+                        self._enqueue(f"❌ Conversion failed after {step_time:.1f}s")
+                        self.finished.emit(False, f"Failed to convert .deb package after {step_time:.1f}s")
+                        return
+                    
+                    self._enqueue(SEP_DASH)
+                    self._enqueue(f"✅ Conversion completed in {step_time:.1f}s")
+                    self.time_update.emit(f"Conversion completed in {step_time:.1f}s")
+                    self._store_cached_package(digest, arch_package)
+                
+                pkg_size_mb = os.path.getsize(arch_package) / (1024 * 1024)
+                pkg_name = os.path.basename(arch_package)
+                self._enqueue(f"📦 Generated: {pkg_name} ({pkg_size_mb:.1f} MB)\n")
+                self.progress_value.emit(70)
+                
+                # Step 5: Install the converted package
+                self.progress_update.emit(f"Installing package... ({pkg_size_mb:.1f} MB)")
+                self.progress_value.emit(75)
+                self._enqueue(STEP_BANNERS[3])
+                self._enqueue(f"📥 Installing {pkg_name}...")
+                self._enqueue("🔐 Running: sudo pacman -U --noconfirm")
+                self._enqueue(SEP_DASH)
                 
+                step_start = time.time()
+                if self.install_arch_package(arch_package):
+                    step_time = time.time() - step_start
+                    total_time = time.time() - self.start_time
+                    
+                    self._enqueue(SEP_DASH)
+                    self._enqueue(f"✅ Installation completed in {step_time:.1f}s")
+                    self._enqueue("\n" + SEP_EQ)
+                    self._enqueue("🎉 SUCCESS!")
+                    self._enqueue(SEP_EQ)
+                    self._enqueue(f"⏱️  Total time: {total_time:.1f} seconds")
+                    
+                    self.progress_update.emit("Installation completed!")
+                    self.progress_value.emit(100)
+                    self.time_update.emit(f"Total time: {total_time:.1f}s")
+                    self.finished.emit(True, f"Package installed successfully!\nTotal time: {total_time:.1f} seconds")
+                else:
+                    step_time = time.time() - step_start
+                    self._enqueue(SEP_DASH)
+                    self._enqueue(f"❌ Installation failed after {step_time:.1f}s")
+                    if from_cache:
+                        self._drop_cached_package(arch_package)
+                    self.finished.emit(False, f"Failed to install package after {step_time:.1f}s")
+                    
         except Exception as e:
             total_time = time.time() - self.start_time if self.start_time else 0
-            self.console_output.emit(f"\n❌ Error after {total_time:.1f}s: {str(e)}")
+            self._enqueue(f"\n❌ Error after {total_time:.1f}s: {str(e)}")
+            self._wait_for_db_update()  # Nothing may block once finished is emitted
             self.finished.emit(False, f"Error after {total_time:.1f}s: {str(e)}")
         finally:
-            # Cleanup
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                self.console_output.emit(f"\n🧹 Cleaning up temporary files...")
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
-                self.console_output.emit("✅ Cleanup complete")
+            self._wait_for_db_update()  # Safety net, normally already joined
+            self._close_askpass()
+            self.sudo_password = None
     
     def run_sudo_command(self, cmd):
-        """Run command with sudo using provided password"""
-        if not self.sudo_password:
+        """Run command with sudo, reusing the cached credential when possible"""
+        # The GUI keeps the sudo timestamp fresh, so usually no new
+        # authentication is needed; otherwise sudo asks our askpass helper
+        cached = subprocess.run(['sudo', '-n', '-v'], capture_output=True).returncode == 0
+        if not cached and not self.sudo_password:
             return None
         
         # Create sudo command
-        sudo_cmd = ['sudo', '-S'] + cmd
+        if cached:
+            sudo_cmd, env = ['sudo', '-n'] + cmd, None
+        else:
+            sudo_cmd, env = ['sudo', '-A'] + cmd, self._askpass_env()
         
         process = subprocess.Popen(
             sudo_cmd,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
+            bufsize=0,  # Binary and unbuffered, output is read and decoded by _stream_process
+            env=env
         )
         
-        # Send password
-        process.stdin.write(self.sudo_password + '\n')
-        process.stdin.flush()
-        
         return process
     
+    def _askpass_env(self):
+        """Environment pointing SUDO_ASKPASS at an in-memory helper script"""
+        with self._askpass_lock:
+            if self._askpass_fd is None:
+                # memfd: the script never touches the disk and goes away with the fd
+                script = f"#!/bin/sh\nprintf '%s\\n' {shlex.quote(self.sudo_password)}\n"
+                fd = os.memfd_create("askpass")
+                os.write(fd, script.encode())
+                os.fchmod(fd, 0o700)
+                self._askpass_fd = fd
+            
+            return {**os.environ, 'SUDO_ASKPASS': f"/proc/{os.getpid()}/fd/{self._askpass_fd}"}
+    
+    def _close_askpass(self):
+        """Destroy the askpass helper"""
+        with self._askpass_lock:
+            if self._askpass_fd is not None:
+                os.close(self._askpass_fd)
+                self._askpass_fd = None
+    
+    def _which(self, name):
+        """Look up a command on PATH, caching the result"""
+        if name not in self._which_cache:
+            self._which_cache[name] = shutil.which(name)
+        return self._which_cache[name]
+    
+    def _stream_process(self, process, interval=0.1, deadline=None):
+        """Yield output lines of a running process as they arrive
+        
+        Raises subprocess.TimeoutExpired once time.monotonic() passes deadline.
+        """
+        fd = process.stdout.fileno()
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        
+        buffer = bytearray()
+        start = time.monotonic()
+        while True:
+            if deadline is not None and time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(process.args, deadline - start)
+            
+            ready, _, _ = select.select([fd], [], [], interval)
+            if ready:
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    break  # EOF, process closed its output
+                
+                buffer.extend(data)
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    yield line.decode('utf-8', 'replace').rstrip()
+            elif process.poll() is not None:
+                # Process exited; drain what it wrote after the last select()
+                # but don't wait for EOF (a child it spawned may still hold
+                # the pipe open)
+                while True:
+                    try:
+                        data = os.read(fd, 65536)
+                    except BlockingIOError:
+                        break
+                    if not data:
+                        break
+                    buffer.extend(data)
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    yield line.decode('utf-8', 'replace').rstrip()
+                break
+        
+        if buffer:
+            yield buffer.decode('utf-8', 'replace').rstrip()
+        process.wait()
+    
+    def _run_and_stream(self, cmd, filter_password=True, prefix="  ", on_line=None):
+        """Run a command with sudo, queue its output and return the exit code
+        
+        Returns None if the command could not be started. on_line, if given,
+        is called with the process and every queued line.
+        """
+        process = self.run_sudo_command(cmd)
+        if not process:
+            return None
+        
+        for line in self._stream_process(process):
+            if not line or (filter_password and 'password' in line.lower()):
+                continue
+            self._enqueue(prefix + line)
+            if on_line:
+                on_line(process, line)
+        
+        return process.returncode
+    
     def check_debtap(self):
         """Check if debtap is installed, install if not found"""
         try:
-            result = subprocess.run(['which', 'debtap'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                self.console_output.emit("✅ debtap found and ready!")
+            if self._which('debtap'):
+                self._enqueue("✅ debtap found and ready!")
                 return True
             else:
-                self.console_output.emit("❌ debtap not found, attempting auto-install...")
+                self._enqueue("❌ debtap not found, attempting auto-install...")
                 return self.install_debtap()
         except Exception as e:
-            self.console_output.emit(f"❌ Error checking debtap: {e}")
-            self.console_output.emit("🔧 Attempting to install debtap...")
+            self._enqueue(f"❌ Error checking debtap: {e}")
+            self._enqueue("🔧 Attempting to install debtap...")
             return self.install_debtap()
     
     def install_debtap(self):
         """Auto-install debtap using available package managers"""
-        self.console_output.emit("🔧 Auto-installing debtap...")
+        self._enqueue("🔧 Auto-installing debtap...")
         
         # Try different package managers in order of preference
         package_managers = [
@@ -256,270 +437,325 @@ class InstallWorker(QThread):
         for cmd, manager_name in package_managers:
             try:
                 # Check if package manager exists
-                check_result = subprocess.run(['which', cmd[0]], 
-                                            capture_output=True, text=True)
-                if check_result.returncode != 0:
+                if not self._which(cmd[0]):
                     continue  # Package manager not found, try next
                 
-                self.console_output.emit(f"📦 Found {manager_name}, installing debtap...")
+                self._enqueue(f"📦 Found {manager_name}, installing debtap...")
                 
                 # Run installation with sudo and password
-                process = self.run_sudo_command(cmd)
-                if not process:
-                    self.console_output.emit("❌ Could not start installation process")
+                return_code = self._run_and_stream(cmd)
+                if return_code is None:
+                    self._enqueue("❌ Could not start installation process")
                     continue
                 
-                # Stream output
-                install_output = []
-                while True:
-                    line = process.stdout.readline()
-                    if line:
-                        line = line.rstrip()
-                        if line and 'password' not in line.lower():
-                            self.console_output.emit(f"  {line}")
-                            install_output.append(line)
+                if return_code == 0:
+                    self._enqueue("✅ debtap installation completed!")
                     
-                    if process.poll() is not None:
-                        remaining = process.stdout.read()
-                        if remaining:
-                            for line in remaining.split('\n'):
-                                if line.strip() and 'password' not in line.lower():
-                                    self.console_output.emit(f"  {line.rstrip()}")
-                        break
-                
-                if process.returncode == 0:
-                    self.console_output.emit("✅ debtap installation completed!")
-                    
-                    # Verify installation worked
-                    verify_result = subprocess.run(['which', 'debtap'], 
-                                                 capture_output=True, text=True)
-                    if verify_result.returncode == 0:
-                        self.console_output.emit("✅ debtap installation verified!")
-                        
-                        # Update debtap database
-                        self.console_output.emit("🔄 Updating debtap database...")
-                        try:
-                            update_process = self.run_sudo_command(['debtap', '-u'])
-                            if not update_process:
-                                self.console_output.emit("⚠️  Could not start database update")
-                                return True
-                            
-                            # Stream database update output
-                            while True:
-                                line = update_process.stdout.readline()
-                                if line:
-                                    line = line.rstrip()
-                                    if line and 'password' not in line.lower():
-                                        self.console_output.emit(f"  {line}")
-                                
-                                if update_process.poll() is not None:
-                                    remaining = update_process.stdout.read()
-                                    if remaining:
-                                        for line in remaining.split('\n'):
-                                            if line.strip() and 'password' not in line.lower():
-                                                self.console_output.emit(f"  {line.rstrip()}")
-                                    break
-                            
-                            if update_process.returncode == 0:
-                                self.console_output.emit("✅ debtap database updated successfully!")
-                            else:
-                                self.console_output.emit("⚠️  Database update had issues, but debtap is installed")
-                                self.console_output.emit("💡 You can update manually later with: sudo debtap -u")
-                        except Exception as e:
-                            self.console_output.emit(f"⚠️  Database update error: {e}")
+                    # Verify installation worked (re-probe, the cached lookup is stale)
+                    self._which_cache.pop('debtap', None)
+                    if self._which('debtap'):
+                        self._enqueue("✅ debtap installation verified!")
                         
+                        # Update debtap database in the background, only the
+                        # conversion has to wait for it
+                        self._enqueue("🔄 Updating debtap database...")
+                        from concurrent.futures import ThreadPoolExecutor  # Slow import (pulls in logging)
+                        self._db_executor = ThreadPoolExecutor(max_workers=1)
+                        self._db_future = self._db_executor.submit(self._run_and_stream,
+                                                                   ['debtap', '-u'])
                         return True
                     else:
-                        self.console_output.emit("❌ Installation completed but debtap still not found")
+                        self._enqueue("❌ Installation completed but debtap still not found")
                         continue
                 else:
-                    self.console_output.emit(f"❌ {manager_name} installation failed (exit code: {process.returncode})")
+                    self._enqueue(f"❌ {manager_name} installation failed (exit code: {return_code})")
                     continue
                     
             except Exception as e:
-                self.console_output.emit(f"❌ Error with {manager_name}: {e}")
+                self._enqueue(f"❌ Error with {manager_name}: {e}")
                 continue
         
         # If all package managers failed
-        self.console_output.emit("❌ Auto-installation failed with all package managers")
-        self.console_output.emit("💡 Please install debtap manually:")
-        self.console_output.emit("   yay -S debtap")
-        self.console_output.emit("   sudo debtap -u")
-        self.console_output.emit("")
-        self.console_output.emit("🔍 Available package managers checked:")
+        self._enqueue("❌ Auto-installation failed with all package managers")
+        self._enqueue("💡 Please install debtap manually:")
+        self._enqueue("   yay -S debtap")
+        self._enqueue("   sudo debtap -u")
+        self._enqueue("")
+        self._enqueue("🔍 Available package managers checked:")
         for cmd, name in package_managers:
-            try:
-                subprocess.run(['which', cmd[0]], check=True, capture_output=True)
-                self.console_output.emit(f"   ✅ {name} - available")
-            except:
-                self.console_output.emit(f"   ❌ {name} - not found")
+            if self._which(cmd[0]):
+                self._enqueue(f"   ✅ {name} - available")
+            else:
+                self._enqueue(f"   ❌ {name} - not found")
         
         return False
     
+    def _wait_for_db_update(self):
+        """Wait for a background debtap database update, if one is running"""
+        if self._db_future is None:
+            return
+        
+        try:
+            return_code = self._db_future.result()
+            if return_code is None:
+                self._enqueue("⚠️  Could not start database update")
+            elif return_code == 0:
+                self._enqueue("✅ debtap database updated successfully!")
+            else:
+                self._enqueue("⚠️  Database update had issues, but debtap is installed")
+                self._enqueue("💡 You can update manually later with: sudo debtap -u")
+        except Exception as e:
+            self._enqueue(f"⚠️  Database update error: {e}")
+        finally:
+            self._db_executor.shutdown()
+            self._db_future = self._db_executor = None
+    
     def convert_deb_package(self, temp_deb_path):
         """Convert .deb package to Arch package using debtap with live output"""
         try:
-            original_cwd = os.getcwd()
-            os.chdir(self.temp_dir)
-            
             # Get package name for better debtap handling
-            deb_filename = os.path.basename(temp_deb_path)
+            deb_filename = self.basename
             package_name = deb_filename.split('_')[0]  # Extract base package name
             
-            self.console_output.emit(f"📦 Detected package name: {package_name}")
+            self._enqueue(f"📦 Detected package name: {package_name}")
             
             # Run debtap conversion with better error handling
             # Use -Q for quieter mode but still get important output
             cmd = ['debtap', '-Q', deb_filename]
             
-            # Set environment to avoid interactive prompts
-            env = os.environ.copy()
-            env['DEBTAP_NOCOLOR'] = '1'
-            
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 stdin=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1,
-                env=env
+                bufsize=0,
+                env=_DEBTAP_ENV,
+                cwd=self.temp_dir  # debtap writes the package to its working directory
             )
             
             # Provide default answers to common debtap prompts
             default_answers = f"{package_name}\n\n\n"  # Package name, maintainer (empty), license (empty)
             
+            process.stdin.write(default_answers.encode())
+            process.stdin.flush()
+            process.stdin.close()
+            
             try:
-                stdout, _ = process.communicate(input=default_answers, timeout=300)  # 5 minute timeout
-                
-                for line in stdout.split('\n'):
-                    line = line.strip()
-                    if line and not line.startswith('==>'):  # Filter out some noise
-                        self.console_output.emit(line)
+                # Stream the output live, 5 minute timeout
+                for line in self._stream_process(process, deadline=time.monotonic() + 300):
+                    if line and not line.isspace() and not line.startswith('==>'):  # Filter out some noise
+                        self._enqueue(line)
                         
             except subprocess.TimeoutExpired:
                 process.kill()
-                self.console_output.emit("❌ Conversion timed out after 5 minutes")
+                process.wait()
+                self._enqueue("❌ Conversion timed out after 5 minutes")
                 return None
             
-            os.chdir(original_cwd)
-            
             if process.returncode != 0:
-                self.console_output.emit(f"❌ debtap failed with return code: {process.returncode}")
+                self._enqueue(f"❌ debtap failed with return code: {process.returncode}")
                 return None
             
-            # Find the generated package file
-            pkg_files = []
-            for file in os.listdir(self.temp_dir):
-                if file.endswith('.pkg.tar.zst') or file.endswith('.pkg.tar.xz'):
-                    pkg_files.append(file)
+            # Find the generated package file (the first, and usually only, one)
+            pkg_file = None
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(PKG_SUFFIXES):
+                        pkg_file = entry.name
+                        break
             
-            if not pkg_files:
-                self.console_output.emit("❌ No package file generated")
+            if pkg_file is None:
+                self._enqueue("❌ No package file generated")
                 # List all files for debugging
-                self.console_output.emit("Files in temp directory:")
-                for file in os.listdir(self.temp_dir):
-                    self.console_output.emit(f"  - {file}")
+                self._enqueue("Files in temp directory:")
+                with os.scandir(self.temp_dir) as entries:
+                    for entry in entries:
+                        self._enqueue(f"  - {entry.name}")
                 return None
             
-            # Use the first (and usually only) package file
-            pkg_file = pkg_files[0]
-            self.console_output.emit(f"✅ Found generated package: {pkg_file}")
+            self._enqueue(f"✅ Found generated package: {pkg_file}")
             
             return os.path.join(self.temp_dir, pkg_file)
             
         except Exception as e:
-            self.console_output.emit(f"Exception during conversion: {str(e)}")
+            self._enqueue(f"Exception during conversion: {str(e)}")
             return None
     
+    def _hash_deb(self):
+        """SHA-256 of the .deb file, used as the conversion cache key"""
+        import hashlib  # Loads OpenSSL, only needed once the worker runs
+        import mmap
+        
+        with open(self.deb_file_path, 'rb') as f:
+            if sys.version_info >= (3, 11):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            
+            # Hash the whole file as one contiguous buffer
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+    
+    def _cached_package(self, digest):
+        """Return the cached conversion of this .deb, if any"""
+        for suffix in PKG_SUFFIXES:
+            path = CACHE_DIR / (digest + suffix)
+            if path.exists():
+                os.utime(path)  # Mark as recently used
+                return str(path)
+        return None
+    
+    def _store_cached_package(self, digest, package_path):
+        """Keep a converted package for later installs of the same .deb"""
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            suffix = next(s for s in PKG_SUFFIXES if package_path.endswith(s))
+            cache_path = CACHE_DIR / (digest + suffix)
+            
+            # Write under a temporary name and rename it into place, so an
+            # interrupted copy never leaves a truncated package to reuse
+            part_path = CACHE_DIR / f".{digest}{suffix}.part"
+            try:
+                try:
+                    os.link(package_path, part_path)
+                except OSError:
+                    shutil.copy2(package_path, part_path)  # Usual case, /tmp is tmpfs
+                os.replace(part_path, cache_path)
+            except OSError:
+                part_path.unlink(missing_ok=True)
+                raise
+            
+            # Evict least recently used packages above the size limit, leaving
+            # alone copies another instance is still writing
+            entries = []
+            for path in CACHE_DIR.iterdir():
+                if path.name.endswith('.part'):
+                    continue
+                try:
+                    entries.append((path.stat(), path))
+                except FileNotFoundError:
+                    continue  # Evicted by another instance meanwhile
+            entries.sort(key=lambda entry: entry[0].st_atime, reverse=True)
+            total = 0
+            for st, path in entries:
+                total += st.st_size
+                if total > CACHE_LIMIT and path != cache_path:
+                    path.unlink(missing_ok=True)
+        except OSError as e:
+            self._enqueue(f"⚠️  Could not cache converted package: {e}")
+    
+    def _drop_cached_package(self, package_path):
+        """Remove a cached package that failed to install, it is converted again next time"""
+        try:
+            os.unlink(package_path)
+            self._enqueue("🗑️  Removed the cached conversion, it will be redone next time")
+        except OSError as e:
+            self._enqueue(f"⚠️  Could not remove cached package: {e}")
+    
     def install_arch_package(self, package_path):
         """Install the converted Arch package with better prompt handling"""
         try:
             # Use sudo with password
             cmd = ['pacman', '-U', '--noconfirm', '--needed', package_path]
             
-            self.console_output.emit(f"🔐 Running: sudo {' '.join(cmd)}")
+            self._enqueue(f"🔐 Running: sudo {' '.join(cmd)}")
             
-            # Use run_sudo_command method
-            process = self.run_sudo_command(cmd)
-            if not process:
-                self.console_output.emit("❌ Could not start installation process")
-                return False
+            found_issues = set()  # Failure causes seen so far, for the tips below
             
-            # Read output in real-time
-            output_lines = []
-            while True:
-                line = process.stdout.readline()
-                if line:
-                    line = line.rstrip()
-                    self.console_output.emit(line)
-                    output_lines.append(line)
-                    
-                    # Check for common stuck situations
-                    if any(phrase in line.lower() for phrase in [
-                        'proceed with installation',
-                        'continue?',
-                        '[y/n]',
-                        'replace',
-                        'conflict'
-                    ]):
-                        # Send 'y' to continue
-                        try:
-                            process.stdin.write('y\n')
-                            process.stdin.flush()
-                            self.console_output.emit("→ Automatically answered 'y'")
-                        except:
-                            pass
+            def on_line(process, line):
+                # Check for common stuck situations
+                if self._PROMPT_RE.search(line):
+                    # Send 'y' to continue
+                    try:
+                        process.stdin.write(b'y\n')
+                        process.stdin.flush()
+                        self._enqueue("→ Automatically answered 'y'")
+                    except:
+                        pass
                 
-                # Check if process finished
-                if process.poll() is not None:
-                    # Read any remaining output
-                    remaining = process.stdout.read()
-                    if remaining:
-                        for line in remaining.split('\n'):
-                            if line.strip():
-                                self.console_output.emit(line.rstrip())
-                                output_lines.append(line)
-                    break
-            
-            return_code = process.wait()
+                for match in self._TIP_RE.findall(line):
+                    found_issues.add(match.lower())
+            
+            # Read output in real-time
+            return_code = self._run_and_stream(cmd, filter_password=False, prefix="",
+                                               on_line=on_line)
+            if return_code is None:
+                self._enqueue("❌ Could not start installation process")
+                return False
             
             if return_code == 0:
-                self.console_output.emit("✅ Package installed successfully!")
+                self._enqueue("✅ Package installed successfully!")
                 return True
             else:
-                self.console_output.emit(f"❌ Installation failed with return code: {return_code}")
+                self._enqueue(f"❌ Installation failed with return code: {return_code}")
                 
                 # Check for common issues and provide helpful messages
-                output_text = '\n'.join(output_lines).lower()
-                if 'conflicting files' in output_text:
-                    self.console_output.emit("💡 Tip: Package conflicts with existing files")
-                elif 'dependency' in output_text:
-                    self.console_output.emit("💡 Tip: Missing dependencies - try installing them first")
-                elif 'signature' in output_text:
-                    self.console_output.emit("💡 Tip: Signature issues - package might be corrupted")
-                elif 'disk space' in output_text or 'no space' in output_text:
-                    self.console_output.emit("💡 Tip: Insufficient disk space")
+                for issue, tip in self._TIPS.items():
+                    if issue in found_issues:
+                        self._enqueue(tip)
+                        break
                 
                 return False
                 
         except Exception as e:
-            self.console_output.emit(f"Exception during installation: {str(e)}")
+            self._enqueue(f"Exception during installation: {str(e)}")
             return False
 
 
+class BackgroundTask(QRunnable):
+    """Run a function on the global thread pool, off the UI thread"""
+    
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+    
+    def run(self):
+        self.fn()
+
+
+def is_arch_linux():
+    """Check os-release for Arch Linux or a distribution based on it"""
+    try:
+        info = platform.freedesktop_os_release()  # Parsed and cached by the stdlib
+    except OSError:
+        return True  # Can't tell, don't nag
+    return info.get("ID") == "arch" or "arch" in info.get("ID_LIKE", "").split()
+
+
+def warm_directory_cache(path):
+    """stat every entry of a directory so a later listing is served from cache"""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                entry.stat()
+    except OSError:
+        pass
+
+
 class DebInstallerGUI(QMainWindow):
     """Simple installer window for 'Open with' workflow"""
     
+    # Results of file system work done on the thread pool
+    platform_checked = pyqtSignal(bool)  # Running on Arch Linux
+    file_size_ready = pyqtSignal(object)  # Size of the selected .deb in bytes
+    
     def __init__(self, deb_file_path=None):
         super().__init__()
         self.deb_file_path = deb_file_path
+        self._deb_size = os.path.getsize(deb_file_path) if deb_file_path else None
+        self._deb_basename = os.path.basename(deb_file_path) if deb_file_path else None
         self.sudo_password = None
         self.worker = None
+        self.sudo_refresh_timer = None
+        self.platform_checked.connect(self.warn_if_not_arch)
+        self.file_size_ready.connect(self.show_selected_file)
         self.init_ui()
         
-        # Get sudo password first
-        QTimer.singleShot(500, self.get_sudo_password)
+        # The file dialog will list ~/Downloads, warm the cache while we authenticate
+        if not self.deb_file_path:
+            threading.Thread(target=warm_directory_cache,
+                             args=(os.path.expanduser("~/Downloads"),), daemon=True).start()
+        
+        # The sudo password is asked for once the platform check has passed,
+        # see warn_if_not_arch
     
     def init_ui(self):
         """Initialize UI with enhanced progress display and console"""
@@ -541,8 +777,8 @@ class DebInstallerGUI(QMainWindow):
         
         # Package name
         if self.deb_file_path:
-            package_name = os.path.basename(self.deb_file_path)
-            file_size_mb = os.path.getsize(self.deb_file_path) / (1024 * 1024)
+            package_name = self._deb_basename
+            file_size_mb = self._deb_size / (1024 * 1024)
             
             title = QLabel(f"Installing: {package_name}")
             title.setFont(QFont("Arial", 12, QFont.Bold))
@@ -588,10 +824,12 @@ class DebInstallerGUI(QMainWindow):
         console_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         layout.addWidget(console_label)
         
-        self.console_text = QTextEdit()
+        self.console_text = QPlainTextEdit()
         self.console_text.setReadOnly(True)
+        self.console_text.setMaximumBlockCount(2000)  # Keep only the latest lines
+        self.console_text.setUndoRedoEnabled(False)  # Read-only, no undo history to keep
         self.console_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #d4d4d4;
                 font-family: 'Courier New', monospace;
@@ -602,6 +840,14 @@ class DebInstallerGUI(QMainWindow):
         """)
         self.console_text.setMinimumHeight(200)
         layout.addWidget(self.console_text)
+        self._console_scrollbar = self.console_text.verticalScrollBar()
+        
+        # Console output is queued and shown in batches at ~30 Hz
+        self._log_buf = deque()
+        self.console_timer = QTimer(self)
+        self.console_timer.setInterval(33)
+        self.console_timer.timeout.connect(self.flush_console)
+        self.console_timer.start()
         
         # Info label
         info = QLabel("Converting .deb package to Arch format using debtap")
@@ -617,136 +863,167 @@ class DebInstallerGUI(QMainWindow):
             self.sudo_password = dialog.get_password()
             
             # Validate password with multiple checks
-            self.console_text.append("🔐 Validating administrator credentials...")
+            self.update_console("🔐 Validating administrator credentials...")
             
             if not self.sudo_password.strip():
                 QMessageBox.critical(self, "Invalid Password", "Password cannot be empty.")
-                QTimer.singleShot(500, self.get_sudo_password)
+                QTimer.singleShot(0, self.get_sudo_password)
                 return
             
-            # Test password with a more comprehensive check
+            # Test password
             try:
-                # Test 1: Basic sudo test
                 process = subprocess.Popen(
                     ['sudo', '-S', '-v'],  # -v validates and extends timeout
                     stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    universal_newlines=True
+                    universal_newlines=True,
+                    env={**os.environ, 'LC_ALL': 'C'}  # Untranslated messages, matched below
                 )
                 
                 stdout, stderr = process.communicate(input=self.sudo_password + '\n')
                 
                 if process.returncode == 0:
-                    self.console_text.append("✅ Password validation successful")
-                    
-                    # Test 2: Verify we can actually run sudo commands
-                    test_process = subprocess.Popen(
-                        ['sudo', '-S', 'whoami'],
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        universal_newlines=True
-                    )
+                    # sudo -v only succeeds for users allowed to run commands, and
+                    # it leaves a timestamp that later commands reuse without a password
+                    self.update_console("✅ Administrator access confirmed")
+                    self.start_sudo_refresh()
                     
-                    test_stdout, test_stderr = test_process.communicate(input=self.sudo_password + '\n')
-                    
-                    if test_process.returncode == 0 and 'root' in test_stdout:
-                        self.console_text.append("✅ Administrator access confirmed")
-                        
-                        # Continue with original flow
-                        if self.deb_file_path:
-                            QTimer.singleShot(500, self.confirm_and_install)
-                        else:
-                            QTimer.singleShot(500, self.select_file)
+                    # Continue with original flow
+                    if self.deb_file_path:
+                        QTimer.singleShot(0, self.confirm_and_install)
                     else:
-                        self.console_text.append("❌ Failed to execute sudo commands")
-                        QMessageBox.critical(self, "Authentication Failed", 
-                                           "Password accepted but cannot execute sudo commands.\n"
-                                           "Please check your sudo permissions.")
-                        QTimer.singleShot(500, self.get_sudo_password)
+                        QTimer.singleShot(0, self.select_file)
                 else:
                     # Handle different error cases
                     error_msg = stderr.strip() if stderr else "Unknown error"
-                    self.console_text.append(f"❌ Authentication failed: {error_msg}")
+                    self.update_console(f"{LOG_ERR}Authentication failed: {error_msg}")
                     
-                    if "incorrect password" in error_msg.lower() or "sorry" in error_msg.lower():
-                        QMessageBox.critical(self, "Incorrect Password", 
-                                           "The password you entered is incorrect.\nPlease try again.")
-                    elif "not in the sudoers file" in error_msg.lower():
+                    # Checked first: "Sorry, user ... may not run sudo" also says sorry
+                    if "not in the sudoers file" in error_msg or "may not run sudo" in error_msg:
                         QMessageBox.critical(self, "Permission Denied", 
                                            "Your user account is not in the sudoers file.\n"
                                            "Please contact your system administrator.")
                         QApplication.quit()
                         return
+                    elif "incorrect password" in error_msg or "Sorry, try again" in error_msg:
+                        QMessageBox.critical(self, "Incorrect Password", 
+                                           "The password you entered is incorrect.\nPlease try again.")
                     else:
                         QMessageBox.critical(self, "Authentication Failed", 
                                            f"Authentication failed: {error_msg}\nPlease try again.")
                     
-                    QTimer.singleShot(500, self.get_sudo_password)
+                    QTimer.singleShot(0, self.get_sudo_password)
                     
             except Exception as e:
-                self.console_text.append(f"❌ Authentication error: {e}")
+                self.update_console(f"{LOG_ERR}Authentication error: {e}")
                 QMessageBox.critical(self, "Error", f"Authentication error: {e}\nPlease try again.")
-                QTimer.singleShot(500, self.get_sudo_password)
+                QTimer.singleShot(0, self.get_sudo_password)
         else:
             QMessageBox.information(self, "Access Required", 
                                   "Administrator access is required to install packages.")
             QApplication.quit()
     
+    def start_sudo_refresh(self):
+        """Keep the sudo timestamp alive so later sudo calls skip authentication"""
+        if self.sudo_refresh_timer is None:
+            self.sudo_refresh_timer = QTimer(self)
+            self.sudo_refresh_timer.setInterval(4 * 60 * 1000)  # sudo's default timeout is 5 minutes
+            self.sudo_refresh_timer.timeout.connect(self.refresh_sudo_timestamp)
+        self.sudo_refresh_timer.start()
+    
+    def refresh_sudo_timestamp(self):
+        """Extend the sudo timestamp without prompting"""
+        subprocess.run(['sudo', '-n', '-v'], capture_output=True)
+    
     def select_file(self):
         """Select .deb file to install"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Debian Package",
-            os.path.expanduser("~/Downloads"),
-            "Debian Packages (*.deb);;All Files (*)"
-        )
+        # Non-blocking dialog that only offers .deb files, file_selected takes it from there
+        dialog = QFileDialog(self, "Select Debian Package", os.path.expanduser("~/Downloads"))
+        dialog.setNameFilters(["Debian Packages (*.deb)"])
+        dialog.setFileMode(QFileDialog.ExistingFile)
+        dialog.fileSelected.connect(self.file_selected)
+        dialog.rejected.connect(QApplication.quit)  # User cancelled
+        dialog.open()
+    
+    def file_selected(self, file_path):
+        """Use the .deb file picked in the file dialog"""
+        self.deb_file_path = file_path
+        self._deb_basename = os.path.basename(file_path)
         
-        if file_path and file_path.endswith('.deb'):
-            self.deb_file_path = file_path
-            
-            # Update UI with selected file
-            package_name = os.path.basename(file_path)
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            
-            # Update title
-            self.setWindowTitle(f"Installing: {package_name}")
-            
-            # Hide select button and show file info
-            if hasattr(self, 'select_btn'):
-                self.select_btn.setVisible(False)
-            
-            self.console_text.append(f"📦 Selected: {package_name} ({file_size_mb:.1f} MB)\n")
-            
-            # Start installation
-            QTimer.singleShot(500, self.confirm_and_install)
-        elif not file_path:
-            # User cancelled
-            QApplication.quit()
-        else:
-            QMessageBox.warning(self, "Invalid File", "Please select a .deb package file.")
-            QTimer.singleShot(500, self.select_file)
+        # Update title
+        self.setWindowTitle(f"Installing: {self._deb_basename}")
+        
+        # Hide select button and show file info
+        if hasattr(self, 'select_btn'):
+            self.select_btn.setVisible(False)
+        
+        # stat the file on the thread pool, show_selected_file continues from there
+        QThreadPool.globalInstance().start(
+            BackgroundTask(lambda: self.file_size_ready.emit(os.path.getsize(file_path))))
+    
+    def show_selected_file(self, size):
+        """Show the selected file's size and go on to the installation"""
+        self._deb_size = size
+        file_size_mb = size / (1024 * 1024)
+        self.update_console(f"{LOG_PKG}Selected: {self._deb_basename} ({file_size_mb:.1f} MB)\n")
+        
+        # Start installation
+        QTimer.singleShot(0, self.confirm_and_install)
+    
+    def check_platform_async(self):
+        """Check the distribution on the thread pool"""
+        QThreadPool.globalInstance().start(
+            BackgroundTask(lambda: self.platform_checked.emit(is_arch_linux())))
+    
+    def warn_if_not_arch(self, is_arch):
+        """Ask whether to continue when not running on Arch Linux, then get the sudo password"""
+        if not is_arch:
+            reply = QMessageBox.question(self, "Warning", 
+                                       "This application is designed for Arch Linux.\n"
+                                       "Continue anyway?",
+                                       QMessageBox.Yes | QMessageBox.No,
+                                       QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                QApplication.exit(1)
+                return
+        
+        # Get sudo password first
+        self.get_sudo_password()
     
     def confirm_and_install(self):
         """Show confirmation and start installation"""
         if not self.deb_file_path:
             return
             
-        package_name = os.path.basename(self.deb_file_path)
+        # The user may have turned the confirmation off
+        settings = QSettings("DebInstaller", "gui")
+        if settings.value("skipConfirm", False, type=bool):
+            self.start_installation()
+            return
+        
+        package_name = self._deb_basename
         
-        reply = QMessageBox.question(
-            self, "Install Package",
+        box = QMessageBox(
+            QMessageBox.Question, "Install Package",
             f"Install {package_name}?\n\n"
             "This will:\n"
             "• Check/install debtap if needed\n"
             "• Convert the .deb package using debtap\n"
             "• Install the converted package\n\n"
-            "Note: You'll be prompted for sudo password",
+            "Note: The sudo password you entered will be used",
             QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.Yes
+            self
         )
+        box.setDefaultButton(QMessageBox.Yes)
+        dont_ask = QCheckBox("Don't ask again")
+        dont_ask.setToolTip("Start with --confirm to get this question back")
+        box.setCheckBox(dont_ask)
+        reply = box.exec_()
         
         if reply == QMessageBox.Yes:
+            if dont_ask.isChecked():
+                settings.setValue("skipConfirm", True)
             self.start_installation()
         else:
             QApplication.quit()
@@ -755,15 +1032,16 @@ class DebInstallerGUI(QMainWindow):
         """Start the installation process"""
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.console_text.append("🚀 Starting installation process...\n")
+        self.update_console(LOG_RUN + "Starting installation process...\n")
         
         # Start worker thread with sudo password
-        self.worker = InstallWorker(self.deb_file_path, self.sudo_password)
+        self.worker = InstallWorker(self.deb_file_path, self.sudo_password,
+                                    size=self._deb_size, basename=self._deb_basename)
+        self.sudo_password = None  # Only the worker needs it from here on
         self.worker.progress_update.connect(self.update_status)
         self.worker.progress_value.connect(self.update_progress)
         self.worker.time_update.connect(self.update_time)
-        self.worker.console_output.connect(self.update_console)
-        self.worker.finished.connect(self.installation_finished)
+        self.worker.finished.connect(self.installation_finished, Qt.QueuedConnection)
         self.worker.start()
     
     def update_status(self, message):
@@ -779,21 +1057,52 @@ class DebInstallerGUI(QMainWindow):
         self.time_label.setText(message)
     
     def update_console(self, message):
-        """Update console output"""
-        self.console_text.append(message)
-        # Auto-scroll to bottom
-        scrollbar = self.console_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """Queue a message for the console"""
+        self._log_buf.append(message)
+    
+    def flush_console(self):
+        """Show queued console output from the GUI and the worker"""
+        if self.worker:
+            text = self.worker.take_output()
+            if text:
+                self._log_buf.append(text)
+        if not self._log_buf:
+            return
+        
+        batch = "\n".join(self._log_buf)
+        self._log_buf.clear()
+        
+        # One insert and one scroll per batch, repainted once
+        self.console_text.setUpdatesEnabled(False)
+        self.console_text.appendPlainText(batch)
+        self._console_scrollbar.setValue(self._console_scrollbar.maximum())
+        self.console_text.setUpdatesEnabled(True)
     
     def installation_finished(self, success, message):
         """Handle installation completion"""
+        # Release the worker now instead of after the user dismisses the
+        # dialog. It should only have its workspace cleanup left, but keep
+        # the UI responsive while joining in case that takes a moment
+        self.worker.quit()
+        while not self.worker.wait(100):
+            QApplication.processEvents()
+        self.flush_console()
+        self.worker.deleteLater()
+        self.worker = None
+        
+        # No more sudo commands will run
+        if self.sudo_refresh_timer:
+            self.sudo_refresh_timer.stop()
+        
         if success:
-            QMessageBox.information(self, "Success", message)
+            box = QMessageBox(QMessageBox.Information, "Success", message, QMessageBox.Ok, self)
         else:
-            QMessageBox.critical(self, "Error", message)
+            box = QMessageBox(QMessageBox.Critical, "Error", message, QMessageBox.Ok, self)
         
-        # Close application
-        QApplication.quit()
+        # Close application once the result has been acknowledged
+        box.setModal(False)
+        box.finished.connect(QApplication.quit)
+        box.show()
 
 
 def main():
@@ -801,32 +1110,27 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("Deb Package Installer")
     
+    args = sys.argv[1:]
+    if '--confirm' in args:
+        # Undo "Don't ask again" on the install confirmation
+        QSettings("DebInstaller", "gui").remove("skipConfirm")
+        args.remove('--confirm')
+    
     # Check if .deb file was provided
     deb_file = None
-    if len(sys.argv) > 1 and sys.argv[1].endswith('.deb'):
-        deb_file = sys.argv[1]
+    if args and args[0].endswith('.deb'):
+        deb_file = args[0]
         if not os.path.exists(deb_file):
             QMessageBox.critical(None, "Error", f"File not found: {deb_file}")
             sys.exit(1)
     
-    # Check if running on Arch Linux
-    try:
-        with open('/etc/os-release', 'r') as f:
-            os_info = f.read()
-            if 'arch' not in os_info.lower():
-                reply = QMessageBox.question(None, "Warning", 
-                                           "This application is designed for Arch Linux.\n"
-                                           "Continue anyway?",
-                                           QMessageBox.Yes | QMessageBox.No,
-                                           QMessageBox.No)
-                if reply != QMessageBox.Yes:
-                    sys.exit(1)
-    except:
-        pass
-    
     window = DebInstallerGUI(deb_file)
     window.show()
     
+    # Check if running on Arch Linux once the event loop runs, the rest of
+    # the flow continues from warn_if_not_arch
+    QTimer.singleShot(0, window.check_platform_async)
+    
     sys.exit(app.exec_())
 
 
@@ -22,6 +22,10 @@ echo "🖱️  Removing file associations..."
 sudo rm -f /usr/share/applications/deb-installer.desktop
 sudo update-desktop-database
 
+# Remove cached converted packages
+echo "📦 Removing package cache..."
+rm -rf "${XDG_CACHE_HOME:-$HOME/.cache}/deb_installer"
+
 echo ""
 echo "✅ Uninstallation complete!"
 echo ""